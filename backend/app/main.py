@@ -7,7 +7,8 @@ from fastapi.middleware.cors import CORSMiddleware
 from typing import Dict, Any
 from datetime import date, timedelta
 
-from .db import fetch_all, fetch_one, SCHEMA
+from .db import fetch_all, fetch_one
+from . import queries
 
 
 # ============================================================
@@ -38,7 +39,7 @@ PRODUCT_MAP: Dict[str, Dict[str, Any]] = {}
 def load_product_map():
     """Carga catálogo de productos para simulación."""
     global PRODUCT_MAP
-    rows = fetch_all(f"SELECT sku, category, family FROM {SCHEMA}.products")
+    rows = fetch_all(queries.SQL_PRODUCT_MAP)
     PRODUCT_MAP = {r["sku"]: r for r in rows}
 
 load_product_map()
@@ -75,13 +76,7 @@ def get_rotation_for_sku(sku: str) -> float:
     if sku in ROTATION_CACHE:
         return ROTATION_CACHE[sku]
 
-    sql = f"""
-        SELECT ts::date AS fecha, SUM(quantity) AS daily_out
-        FROM {SCHEMA}.inventory_movements
-        WHERE sku=%s AND movement_type='OUT'
-        GROUP BY fecha;
-    """
-    rows = fetch_all(sql, (sku,))
+    rows = fetch_all(queries.SQL_ROTATION_SKU, (sku,))
 
     if not rows:
         ROTATION_CACHE[sku] = 1.0
@@ -94,13 +89,7 @@ def get_rotation_for_sku(sku: str) -> float:
 
 def get_q1_factor(sku: str) -> float:
     """Ajuste según importancia del SKU en Q1-2025."""
-    sql = f"""
-        SELECT SUM(quantity) AS vol
-        FROM {SCHEMA}.inventory_movements_stage
-        WHERE sku=%s AND movement_type='OUT'
-          AND ts BETWEEN DATE '2025-01-01' AND DATE '2025-02-14';
-    """
-    row = fetch_one(sql, (sku,)) or {"vol": 1}
+    row = fetch_one(queries.SQL_Q1_VOLUME_SKU, (sku,)) or {"vol": 1}
     vol = float(row["vol"] or 1)
 
     # Valor promedio aproximado del dataset Q1-2025
@@ -143,16 +132,7 @@ def simulate_stock_for_sku(sku: str) -> int:
 
 def demand_stats_45(sku: str) -> float:
     """Demanda diaria simulada usando forecast (escenario conservador)."""
-    sql = f"""
-        SELECT 
-            AVG(y_hat_min) AS dem_min,
-            AVG(y_hat)     AS dem_central,
-            AVG(y_hat_max) AS dem_max
-        FROM {SCHEMA}.forecast
-        WHERE sku=%(sku)s
-          AND ds BETWEEN DATE '2025-01-01' AND DATE '2025-02-14';
-    """
-    row = fetch_one(sql, {"sku": sku}) or {}
+    row = fetch_one(queries.SQL_DEMAND_45_SKU, {"sku": sku}) or {}
 
     dem_max = float(row["dem_max"] or 0)
 
@@ -185,29 +165,9 @@ def classify_status(coverage_days):
 
 @app.get("/api/kpis/global")
 def get_global_kpis():
-    sql_eval = f"""
-        SELECT
-            AVG(mape_q1) AS mape_val_hybrid_q1,
-            AVG(rmse_q1) AS rmse_val_hybrid_q1,
-            COUNT(DISTINCT sku) AS total_skus
-        FROM {SCHEMA}.model_eval;
-    """
-    eval_row = fetch_one(sql_eval) or {}
-
-    sql_real = f"""
-        SELECT COALESCE(SUM(quantity),0) AS real_total_q1
-        FROM {SCHEMA}.inventory_movements_stage
-        WHERE movement_type = 'OUT'
-          AND ts BETWEEN DATE '2025-01-01' AND DATE '2025-02-14';
-    """
-    real_row = fetch_one(sql_real) or {}
-
-    sql_pred = f"""
-        SELECT COALESCE(SUM(y_hat),0) AS pred_total_q1
-        FROM {SCHEMA}.forecast
-        WHERE ds BETWEEN DATE '2025-01-01' AND DATE '2025-02-14';
-    """
-    pred_row = fetch_one(sql_pred) or {}
+    eval_row = fetch_one(queries.SQL_KPI_EVAL) or {}
+    real_row = fetch_one(queries.SQL_KPI_REAL_Q1) or {}
+    pred_row = fetch_one(queries.SQL_KPI_PRED_Q1) or {}
 
     real_total = float(real_row.get("real_total_q1") or 0)
     pred_total = float(pred_row.get("pred_total_q1") or 0)
@@ -229,12 +189,7 @@ def get_global_kpis():
 
 @app.get("/api/skus")
 def get_skus():
-    sql = f"""
-        SELECT sku, product_name, family, category
-        FROM {SCHEMA}.products
-        ORDER BY sku;
-    """
-    return fetch_all(sql)
+    return fetch_all(queries.SQL_SKUS)
 
 
 # ============================================================
@@ -243,14 +198,7 @@ def get_skus():
 
 @app.get("/api/history/{sku}")
 def get_history_for_sku(sku: str):
-    sql = f"""
-        SELECT ts::date AS date, SUM(quantity) AS y
-        FROM {SCHEMA}.inventory_movements
-        WHERE sku=%(sku)s AND movement_type='OUT'
-        GROUP BY ts::date
-        ORDER BY date;
-    """
-    rows = fetch_all(sql, {"sku": sku})
+    rows = fetch_all(queries.SQL_HISTORY_SKU, {"sku": sku})
     if not rows:
         raise HTTPException(status_code=404, detail="SKU sin histórico")
     return rows
@@ -262,13 +210,7 @@ def get_history_for_sku(sku: str):
 
 @app.get("/api/forecast/{sku}")
 def get_forecast_for_sku(sku: str):
-    sql = f"""
-        SELECT sku, ds::date AS date, y_hat_min, y_hat, y_hat_max, model_type
-        FROM {SCHEMA}.forecast
-        WHERE sku = %(sku)s
-        ORDER BY ds;
-    """
-    rows = fetch_all(sql, {"sku": sku})
+    rows = fetch_all(queries.SQL_FORECAST_SKU, {"sku": sku})
     if not rows:
         raise HTTPException(status_code=404, detail="SKU sin forecast")
     return rows
@@ -280,15 +222,7 @@ def get_forecast_for_sku(sku: str):
 
 @app.get("/api/real/sku/{sku}")
 def get_real_45_for_sku(sku: str):
-    sql = f"""
-        SELECT ts::date AS date, SUM(quantity) AS y
-        FROM {SCHEMA}.inventory_movements_stage
-        WHERE sku=%(sku)s AND movement_type='OUT'
-          AND ts BETWEEN DATE '2025-01-01' AND DATE '2025-02-14'
-        GROUP BY ts::date
-        ORDER BY date;
-    """
-    return fetch_all(sql, {"sku": sku})
+    return fetch_all(queries.SQL_REAL_Q1_SKU, {"sku": sku})
 
 
 # ============================================================
@@ -297,13 +231,7 @@ def get_real_45_for_sku(sku: str):
 
 @app.get("/api/top_skus/error")
 def get_top_skus_error(limit: int = 10):
-    sql = f"""
-        SELECT sku, mape_q1 AS mape_45d, rmse_q1 AS rmse_45d
-        FROM {SCHEMA}.model_eval
-        ORDER BY mape_q1 DESC
-        LIMIT %(limit)s;
-    """
-    return fetch_all(sql, {"limit": limit})
+    return fetch_all(queries.SQL_TOP_ERROR, {"limit": limit})
 
 
 # ============================================================
@@ -312,35 +240,12 @@ def get_top_skus_error(limit: int = 10):
 
 @app.get("/api/forecast_compare")
 def forecast_compare(sku: str):
-    hist_sql = f"""
-        SELECT ts::date AS date, SUM(quantity) AS y
-        FROM {SCHEMA}.inventory_movements
-        WHERE sku=%(sku)s AND movement_type='OUT'
-        GROUP BY ts::date
-        ORDER BY date DESC
-        LIMIT 60;
-    """
-    hist = fetch_all(hist_sql, {"sku": sku})
+    hist = fetch_all(queries.SQL_HISTORY_LAST_60_SKU, {"sku": sku})
     hist = list(reversed(hist))
 
-    pred_sql = f"""
-        SELECT ds::date AS date, y_hat AS y
-        FROM {SCHEMA}.forecast
-        WHERE sku=%(sku)s
-          AND ds BETWEEN DATE '2025-01-01' AND DATE '2025-02-14'
-        ORDER BY ds;
-    """
-    pred = fetch_all(pred_sql, {"sku": sku})
-
-    real_sql = f"""
-        SELECT ts::date AS date, SUM(quantity) AS y
-        FROM {SCHEMA}.inventory_movements_stage
-        WHERE sku=%(sku)s AND movement_type='OUT'
-          AND ts BETWEEN DATE '2025-01-01' AND DATE '2025-02-14'
-        GROUP BY ts::date
-        ORDER BY date;
-    """
-    real = fetch_all(real_sql, {"sku": sku})
+    pred = fetch_all(queries.SQL_PRED_Q1_SKU, {"sku": sku})
+
+    real = fetch_all(queries.SQL_REAL_Q1_SKU, {"sku": sku})
 
     return {"sku_used": sku, "hist": hist, "pred": pred, "real": real}
 
@@ -354,29 +259,10 @@ def forecast_compare(sku: str):
 @app.get("/api/interannual")
 def interannual_compare(sku: str):
     # Histórico 2022–2024
-    sql_hist = f"""
-        SELECT 
-            EXTRACT(YEAR FROM ts)::int AS year,
-            SUM(quantity) AS total_out
-        FROM {SCHEMA}.inventory_movements
-        WHERE sku = %(sku)s
-          AND movement_type = 'OUT'
-          AND ts::date BETWEEN DATE '2022-01-01' AND DATE '2024-12-31'
-        GROUP BY year
-        ORDER BY year;
-    """
-    hist_rows = fetch_all(sql_hist, {"sku": sku}) or []
+    hist_rows = fetch_all(queries.SQL_INTERANNUAL_HIST, {"sku": sku}) or []
 
     # Q1-2025 (primeros 45 días)
-    sql_q1 = f"""
-        SELECT 
-            COALESCE(SUM(quantity), 0) AS total_out
-        FROM {SCHEMA}.inventory_movements_stage
-        WHERE sku = %(sku)s
-          AND movement_type = 'OUT'
-          AND ts BETWEEN DATE '2025-01-01' AND DATE '2025-02-14';
-    """
-    q1_row = fetch_one(sql_q1, {"sku": sku}) or {"total_out": 0}
+    q1_row = fetch_one(queries.SQL_INTERANNUAL_Q1, {"sku": sku}) or {"total_out": 0}
 
     result = []
 
@@ -402,7 +288,7 @@ def interannual_compare(sku: str):
 @app.get("/api/replenishment/all")
 def replenishment_all(limit: int = 50):
 
-    skus = fetch_all(f"SELECT DISTINCT sku FROM {SCHEMA}.forecast")
+    skus = fetch_all(queries.SQL_FORECAST_SKUS)
     out = []
 
     for r in skus:
@@ -509,15 +395,7 @@ def get_portfolio_kpis():
 
 @app.get("/api/top_skus/rotation")
 def get_top_rotation(limit: int = 10):
-    sql = f"""
-        SELECT sku, SUM(quantity) AS total_out
-        FROM {SCHEMA}.inventory_movements
-        WHERE movement_type='OUT'
-        GROUP BY sku
-        ORDER BY total_out DESC
-        LIMIT %(limit)s;
-    """
-    return fetch_all(sql, {"limit": limit})
+    return fetch_all(queries.SQL_TOP_ROTATION, {"limit": limit})
 
 
 # ============================================================
@@ -530,7 +408,7 @@ def family_coverage():
     data = replenishment_all(limit=999)
 
     # mapear familias
-    family_map = {p["sku"]: p["family"] for p in fetch_all(f"SELECT sku, family FROM {SCHEMA}.products")}
+    family_map = {p["sku"]: p["family"] for p in fetch_all(queries.SQL_PRODUCT_FAMILIES)}
 
     agg = {}
     for d in data:
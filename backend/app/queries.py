@@ -0,0 +1,171 @@
+# ============================================================
+# SQL de los endpoints – fuente única para la API y el harness
+# de planes de ejecución (app/query_plans.py)
+# ============================================================
+
+from .db import SCHEMA
+
+
+# ============================================================
+# SIMULACIÓN (helpers por SKU)
+# ============================================================
+
+SQL_ROTATION_SKU = f"""
+    SELECT ts::date AS fecha, SUM(quantity) AS daily_out
+    FROM {SCHEMA}.inventory_movements
+    WHERE sku=%s AND movement_type='OUT'
+    GROUP BY fecha;
+"""
+
+SQL_Q1_VOLUME_SKU = f"""
+    SELECT SUM(quantity) AS vol
+    FROM {SCHEMA}.inventory_movements_stage
+    WHERE sku=%s AND movement_type='OUT'
+      AND ts BETWEEN DATE '2025-01-01' AND DATE '2025-02-14';
+"""
+
+SQL_DEMAND_45_SKU = f"""
+    SELECT
+        AVG(y_hat_min) AS dem_min,
+        AVG(y_hat)     AS dem_central,
+        AVG(y_hat_max) AS dem_max
+    FROM {SCHEMA}.forecast
+    WHERE sku=%(sku)s
+      AND ds BETWEEN DATE '2025-01-01' AND DATE '2025-02-14';
+"""
+
+
+# ============================================================
+# CATÁLOGO
+# ============================================================
+
+SQL_PRODUCT_MAP = f"SELECT sku, category, family FROM {SCHEMA}.products"
+
+SQL_PRODUCT_FAMILIES = f"SELECT sku, family FROM {SCHEMA}.products"
+
+SQL_SKUS = f"""
+    SELECT sku, product_name, family, category
+    FROM {SCHEMA}.products
+    ORDER BY sku;
+"""
+
+
+# ============================================================
+# KPIs GLOBALES
+# ============================================================
+
+SQL_KPI_EVAL = f"""
+    SELECT
+        AVG(mape_q1) AS mape_val_hybrid_q1,
+        AVG(rmse_q1) AS rmse_val_hybrid_q1,
+        COUNT(DISTINCT sku) AS total_skus
+    FROM {SCHEMA}.model_eval;
+"""
+
+SQL_KPI_REAL_Q1 = f"""
+    SELECT COALESCE(SUM(quantity),0) AS real_total_q1
+    FROM {SCHEMA}.inventory_movements_stage
+    WHERE movement_type = 'OUT'
+      AND ts BETWEEN DATE '2025-01-01' AND DATE '2025-02-14';
+"""
+
+SQL_KPI_PRED_Q1 = f"""
+    SELECT COALESCE(SUM(y_hat),0) AS pred_total_q1
+    FROM {SCHEMA}.forecast
+    WHERE ds BETWEEN DATE '2025-01-01' AND DATE '2025-02-14';
+"""
+
+
+# ============================================================
+# SERIES POR SKU
+# ============================================================
+
+SQL_HISTORY_SKU = f"""
+    SELECT ts::date AS date, SUM(quantity) AS y
+    FROM {SCHEMA}.inventory_movements
+    WHERE sku=%(sku)s AND movement_type='OUT'
+    GROUP BY ts::date
+    ORDER BY date;
+"""
+
+SQL_FORECAST_SKU = f"""
+    SELECT sku, ds::date AS date, y_hat_min, y_hat, y_hat_max, model_type
+    FROM {SCHEMA}.forecast
+    WHERE sku = %(sku)s
+    ORDER BY ds;
+"""
+
+SQL_REAL_Q1_SKU = f"""
+    SELECT ts::date AS date, SUM(quantity) AS y
+    FROM {SCHEMA}.inventory_movements_stage
+    WHERE sku=%(sku)s AND movement_type='OUT'
+      AND ts BETWEEN DATE '2025-01-01' AND DATE '2025-02-14'
+    GROUP BY ts::date
+    ORDER BY date;
+"""
+
+SQL_HISTORY_LAST_60_SKU = f"""
+    SELECT ts::date AS date, SUM(quantity) AS y
+    FROM {SCHEMA}.inventory_movements
+    WHERE sku=%(sku)s AND movement_type='OUT'
+    GROUP BY ts::date
+    ORDER BY date DESC
+    LIMIT 60;
+"""
+
+SQL_PRED_Q1_SKU = f"""
+    SELECT ds::date AS date, y_hat AS y
+    FROM {SCHEMA}.forecast
+    WHERE sku=%(sku)s
+      AND ds BETWEEN DATE '2025-01-01' AND DATE '2025-02-14'
+    ORDER BY ds;
+"""
+
+
+# ============================================================
+# COMPARATIVO INTERANUAL
+# ============================================================
+
+SQL_INTERANNUAL_HIST = f"""
+    SELECT
+        EXTRACT(YEAR FROM ts)::int AS year,
+        SUM(quantity) AS total_out
+    FROM {SCHEMA}.inventory_movements
+    WHERE sku = %(sku)s
+      AND movement_type = 'OUT'
+      AND ts::date BETWEEN DATE '2022-01-01' AND DATE '2024-12-31'
+    GROUP BY year
+    ORDER BY year;
+"""
+
+SQL_INTERANNUAL_Q1 = f"""
+    SELECT
+        COALESCE(SUM(quantity), 0) AS total_out
+    FROM {SCHEMA}.inventory_movements_stage
+    WHERE sku = %(sku)s
+      AND movement_type = 'OUT'
+      AND ts BETWEEN DATE '2025-01-01' AND DATE '2025-02-14';
+"""
+
+
+# ============================================================
+# RANKINGS Y REPOSICIÓN
+# ============================================================
+
+SQL_TOP_ERROR = f"""
+    SELECT sku, mape_q1 AS mape_45d, rmse_q1 AS rmse_45d
+    FROM {SCHEMA}.model_eval
+    ORDER BY mape_q1 DESC
+    LIMIT %(limit)s;
+"""
+
+SQL_TOP_ROTATION = f"""
+    SELECT sku, SUM(quantity) AS total_out
+    FROM {SCHEMA}.inventory_movements
+    WHERE movement_type='OUT'
+    GROUP BY sku
+    ORDER BY total_out DESC
+    LIMIT %(limit)s;
+"""
+
+SQL_FORECAST_SKUS = f"SELECT DISTINCT sku FROM {SCHEMA}.forecast"
@@ -0,0 +1,353 @@
+# ============================================================
+# Harness de planes de ejecución – regresiones de SQL por endpoint
+#
+#   python -m app.query_plans record   # guarda línea base
+#   python -m app.query_plans check    # falla (exit 1) ante regresiones
+#
+# Ejecuta EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) sobre cada consulta
+# de app/queries.py contra la base local con datos a escala sintética.
+# ============================================================
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from . import queries
+from .db import get_conn, SCHEMA
+
+
+BASELINE_PATH = Path(__file__).resolve().parent.parent / "query_plans_baseline.json"
+
+# Tabla "grande": un Seq Scan nuevo sobre ella (ausente en la línea base) es
+# regresión; sin línea base, cualquier Seq Scan no permitido por el caso
+LARGE_TABLE_ROWS = int(os.getenv("PLAN_LARGE_TABLE_ROWS", 10000))
+
+# Mediciones por consulta (tras una ejecución de calentamiento descartada)
+PLAN_RUNS = int(os.getenv("PLAN_RUNS", 5))
+
+# Presupuestos por defecto (consultas acotadas por SKU / LIMIT)
+DEFAULT_MAX_BUFFERS = 1000     # bloques de 8 kB (hit + read)
+DEFAULT_MAX_MS = 50.0
+
+# Presupuestos para ventanas Q1-2025 (45 días) sin filtro por SKU
+WINDOW_MAX_BUFFERS = 5000
+WINDOW_MAX_MS = 250.0
+
+# Presupuestos para agregados globales que recorren la tabla completa
+FULL_SCAN_MAX_BUFFERS = 50000
+FULL_SCAN_MAX_MS = 2000.0
+
+# Tolerancia frente a la línea base grabada
+BUFFER_TOLERANCE = 2.0
+TIME_TOLERANCE = 3.0
+TIME_SLACK_MS = 5.0
+
+
+# ============================================================
+# CASOS: una entrada por consulta de cada endpoint
+# ============================================================
+
+def _sku_dict(sku, limit):
+    return {"sku": sku}
+
+
+def _sku_tuple(sku, limit):
+    return (sku,)
+
+
+def _limit(sku, limit):
+    return {"limit": limit}
+
+
+def _no_params(sku, limit):
+    return None
+
+
+CASES: List[Dict[str, Any]] = [
+    {"name": "product_map", "endpoint": "startup", "sql": queries.SQL_PRODUCT_MAP, "params": _no_params},
+    {"name": "product_families", "endpoint": "/api/family_coverage", "sql": queries.SQL_PRODUCT_FAMILIES, "params": _no_params},
+    {"name": "rotation_sku", "endpoint": "/api/replenishment/all", "sql": queries.SQL_ROTATION_SKU, "params": _sku_tuple},
+    {"name": "q1_volume_sku", "endpoint": "/api/replenishment/all", "sql": queries.SQL_Q1_VOLUME_SKU, "params": _sku_tuple},
+    {"name": "demand_45_sku", "endpoint": "/api/replenishment/all", "sql": queries.SQL_DEMAND_45_SKU, "params": _sku_dict},
+    # Trampa conocida: DISTINCT sku recorre forecast completo hasta que se reescriba
+    {"name": "forecast_skus", "endpoint": "/api/replenishment/all", "sql": queries.SQL_FORECAST_SKUS, "params": _no_params,
+     "full_scan": True, "allow_seq_scan": ["forecast"]},
+    {"name": "kpi_eval", "endpoint": "/api/kpis/global", "sql": queries.SQL_KPI_EVAL, "params": _no_params,
+     "full_scan": True, "allow_seq_scan": ["model_eval"]},
+    # La ventana Q1-2025 sin filtro por SKU cubre casi toda la tabla: Seq Scan es el plan correcto
+    {"name": "kpi_real_q1", "endpoint": "/api/kpis/global", "sql": queries.SQL_KPI_REAL_Q1, "params": _no_params,
+     "max_buffers": WINDOW_MAX_BUFFERS, "max_ms": WINDOW_MAX_MS, "allow_seq_scan": ["inventory_movements_stage"]},
+    {"name": "kpi_pred_q1", "endpoint": "/api/kpis/global", "sql": queries.SQL_KPI_PRED_Q1, "params": _no_params,
+     "max_buffers": WINDOW_MAX_BUFFERS, "max_ms": WINDOW_MAX_MS, "allow_seq_scan": ["forecast"]},
+    {"name": "skus", "endpoint": "/api/skus", "sql": queries.SQL_SKUS, "params": _no_params},
+    {"name": "history_sku", "endpoint": "/api/history/{sku}", "sql": queries.SQL_HISTORY_SKU, "params": _sku_dict},
+    {"name": "forecast_sku", "endpoint": "/api/forecast/{sku}", "sql": queries.SQL_FORECAST_SKU, "params": _sku_dict},
+    {"name": "real_q1_sku", "endpoint": "/api/real/sku/{sku}", "sql": queries.SQL_REAL_Q1_SKU, "params": _sku_dict},
+    {"name": "top_error", "endpoint": "/api/top_skus/error", "sql": queries.SQL_TOP_ERROR, "params": _limit},
+    {"name": "history_last_60_sku", "endpoint": "/api/forecast_compare", "sql": queries.SQL_HISTORY_LAST_60_SKU, "params": _sku_dict},
+    {"name": "pred_q1_sku", "endpoint": "/api/forecast_compare", "sql": queries.SQL_PRED_Q1_SKU, "params": _sku_dict},
+    {"name": "interannual_hist", "endpoint": "/api/interannual", "sql": queries.SQL_INTERANNUAL_HIST, "params": _sku_dict},
+    {"name": "interannual_q1", "endpoint": "/api/interannual", "sql": queries.SQL_INTERANNUAL_Q1, "params": _sku_dict},
+    {"name": "top_rotation", "endpoint": "/api/top_skus/rotation", "sql": queries.SQL_TOP_ROTATION, "params": _limit,
+     "full_scan": True, "allow_seq_scan": ["inventory_movements"]},
+]
+
+
+# ============================================================
+# EXPLAIN Y RESUMEN DEL PLAN
+# ============================================================
+
+def explain(cur, sql: str, params=None) -> Dict[str, Any]:
+    """Ejecuta EXPLAIN ANALYZE y devuelve el plan JSON (primer elemento)."""
+    cur.execute("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + sql.strip(), params)
+    raw = cur.fetchone()[0]
+    if isinstance(raw, str):
+        raw = json.loads(raw)
+    return raw[0]
+
+
+def _walk(node: Dict[str, Any]):
+    yield node
+    for child in node.get("Plans", []):
+        yield from _walk(child)
+
+
+def _shape(node: Dict[str, Any]) -> str:
+    """Forma compacta del plan: 'Limit(Sort(Seq Scan[forecast]))'."""
+    label = node["Node Type"]
+    if "Relation Name" in node:
+        label += f"[{node['Relation Name']}]"
+    if "Index Name" in node:
+        label += f"<{node['Index Name']}>"
+    children = node.get("Plans", [])
+    if children:
+        label += "(" + ", ".join(_shape(c) for c in children) + ")"
+    return label
+
+
+def _scans(root: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Filas estimadas vs reales por nodo de scan, indexado por relación."""
+    scans = {}
+    for n in _walk(root):
+        rel = n.get("Relation Name")
+        if rel is None:
+            continue
+        key, i = rel, 2
+        while key in scans:
+            key, i = f"{rel}#{i}", i + 1
+        scans[key] = {
+            "node": n["Node Type"],
+            "est_rows": n.get("Plan Rows"),
+            "actual_rows": n.get("Actual Rows", 0) * n.get("Actual Loops", 1),
+            "loops": n.get("Actual Loops", 1),
+        }
+    return scans
+
+
+def summarize(plan: Dict[str, Any]) -> Dict[str, Any]:
+    """Extrae forma, filas estimadas/reales, buffers y tiempos del plan."""
+    root = plan["Plan"]
+    hit = root.get("Shared Hit Blocks", 0)
+    read = root.get("Shared Read Blocks", 0)
+    return {
+        "shape": _shape(root),
+        "est_rows": root.get("Plan Rows"),
+        "actual_rows": root.get("Actual Rows"),
+        "shared_hit": hit,
+        "shared_read": read,
+        # hit + read no depende del estado de la caché: es lo que se presupuesta
+        "buffers": hit + read,
+        "planning_ms": round(plan.get("Planning Time", 0.0), 3),
+        "execution_ms": round(plan.get("Execution Time", 0.0), 3),
+        "seq_scans": sorted({
+            n["Relation Name"] for n in _walk(root)
+            if n["Node Type"] == "Seq Scan" and "Relation Name" in n
+        }),
+        "scans": _scans(root),
+    }
+
+
+def aggregate_runs(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combina N mediciones en caliente tomando la ejecución de tiempo mediano.
+
+    Todos los campos (buffers, filas, scans) salen de esa misma ejecución, de
+    modo que shared_hit + shared_read == buffers; se añaden el tiempo mínimo y
+    el máximo de lecturas a disco entre ejecuciones.
+    """
+    ordered = sorted(runs, key=lambda r: r["execution_ms"])
+    summary = dict(ordered[(len(ordered) - 1) // 2])
+    summary["runs"] = len(runs)
+    summary["execution_ms_min"] = ordered[0]["execution_ms"]
+    summary["shared_read_max"] = max(r["shared_read"] for r in runs)
+    return summary
+
+
+def table_rows(cur) -> Dict[str, float]:
+    """Filas estimadas (pg_class.reltuples) por tabla del esquema.
+
+    reltuples = -1 indica una tabla nunca analizada (PG14+).
+    """
+    cur.execute(
+        """
+        SELECT c.relname, c.reltuples
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = %s AND c.relkind IN ('r', 'p');
+        """,
+        (SCHEMA,),
+    )
+    return {name: float(rows) for name, rows in cur.fetchall()}
+
+
+def sample_sku(cur) -> Optional[str]:
+    """SKU con más movimientos: el peor caso para las consultas por SKU."""
+    cur.execute(f"""
+        SELECT sku
+        FROM {SCHEMA}.inventory_movements
+        GROUP BY sku
+        ORDER BY COUNT(*) DESC
+        LIMIT 1;
+    """)
+    row = cur.fetchone()
+    return row[0] if row else None
+
+
+def unanalyzed_tables(sizes: Dict[str, float]) -> List[str]:
+    """Tablas usadas por los casos sin estadísticas: la regla de Seq Scan no sería fiable."""
+    return sorted(
+        name for name, rows in sizes.items()
+        if rows < 0 and any(f"{SCHEMA}.{name}" in case["sql"] for case in CASES)
+    )
+
+
+# ============================================================
+# REGLAS DE REGRESIÓN
+# ============================================================
+
+def check_case(case: Dict[str, Any], summary: Dict[str, Any],
+               sizes: Dict[str, float], baseline: Optional[Dict[str, Any]] = None,
+               check_time: bool = True) -> List[str]:
+    """Devuelve la lista de violaciones del caso (vacía si está OK)."""
+    problems = []
+    full_scan = case.get("full_scan", False)
+    allowed = set(case.get("allow_seq_scan", []))
+    if baseline:
+        # con línea base solo es regresión un Seq Scan que antes no existía
+        allowed |= set(baseline.get("seq_scans", []))
+
+    for rel in summary["seq_scans"]:
+        if rel not in allowed and sizes.get(rel, 0) >= LARGE_TABLE_ROWS:
+            problems.append(f"Seq Scan sobre tabla grande {rel} (~{int(sizes[rel])} filas)")
+
+    max_buffers = case.get("max_buffers", FULL_SCAN_MAX_BUFFERS if full_scan else DEFAULT_MAX_BUFFERS)
+    max_ms = case.get("max_ms", FULL_SCAN_MAX_MS if full_scan else DEFAULT_MAX_MS)
+
+    if summary["buffers"] > max_buffers:
+        problems.append(f"buffers {summary['buffers']} > presupuesto {max_buffers}")
+    if check_time and summary["execution_ms"] > max_ms:
+        problems.append(f"tiempo {summary['execution_ms']} ms > presupuesto {max_ms} ms")
+
+    if baseline:
+        limit_buffers = baseline["buffers"] * BUFFER_TOLERANCE
+        if baseline["buffers"] and summary["buffers"] > limit_buffers:
+            problems.append(f"buffers {summary['buffers']} > {BUFFER_TOLERANCE}x línea base ({baseline['buffers']})")
+        limit_ms = baseline["execution_ms"] * TIME_TOLERANCE + TIME_SLACK_MS
+        if check_time and summary["execution_ms"] > limit_ms:
+            problems.append(f"tiempo {summary['execution_ms']} ms > {TIME_TOLERANCE}x línea base ({baseline['execution_ms']} ms)")
+
+    return problems
+
+
+# ============================================================
+# EJECUCIÓN
+# ============================================================
+
+def run_cases(sku: Optional[str] = None, limit: int = 10, runs: int = PLAN_RUNS) -> Dict[str, Any]:
+    """Corre EXPLAIN para todos los casos y devuelve resúmenes y tamaños.
+
+    Cada caso se ejecuta una vez para calentar la caché y luego `runs` veces.
+    """
+    with get_conn() as cn:
+        with cn.cursor() as cur:
+            sizes = table_rows(cur)
+            missing = unanalyzed_tables(sizes)
+            if missing:
+                raise RuntimeError(
+                    f"tablas sin estadísticas ({', '.join(missing)}); "
+                    f"ejecutar ANALYZE sobre el esquema {SCHEMA}"
+                )
+            sku = sku or sample_sku(cur)
+            results = {}
+            for case in CASES:
+                params = case["params"](sku, limit)
+                explain(cur, case["sql"], params)
+                measured = [summarize(explain(cur, case["sql"], params)) for _ in range(max(runs, 1))]
+                summary = aggregate_runs(measured)
+                results[case["name"]] = dict(summary, endpoint=case["endpoint"])
+        # EXPLAIN ANALYZE ejecuta la consulta: nunca persistir nada
+        cn.rollback()
+    return {"sku": sku, "limit": limit, "table_rows": sizes, "queries": results}
+
+
+def load_baseline(path: Path = BASELINE_PATH) -> Dict[str, Any]:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def record(path: Path = BASELINE_PATH, sku: Optional[str] = None) -> int:
+    report = run_cases(sku)
+    path.write_text(json.dumps(report, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    print(f"Línea base grabada en {path} ({len(report['queries'])} consultas, sku={report['sku']})")
+    return 0
+
+
+def check(path: Path = BASELINE_PATH, sku: Optional[str] = None, check_time: bool = True) -> int:
+    baseline = load_baseline(path)
+    if not baseline:
+        print(f"AVISO: no hay línea base en {path}; solo se evalúan Seq Scan y presupuestos "
+              f"(grabarla con `python -m app.query_plans record`)")
+    report = run_cases(sku or baseline.get("sku"))
+    base_queries = baseline.get("queries", {})
+    failed = 0
+
+    for case in CASES:
+        name = case["name"]
+        summary = report["queries"][name]
+        base = base_queries.get(name)
+        problems = check_case(case, summary, report["table_rows"], base, check_time)
+
+        status = "FAIL" if problems else "OK"
+        print(f"[{status}] {name:<22} {summary['execution_ms']:>9.3f} ms {summary['buffers']:>7} buf  {case['endpoint']}")
+        for p in problems:
+            print(f"        - {p}")
+        if base and base["shape"] != summary["shape"]:
+            # informativo: el cambio de forma no falla por sí solo
+            print(f"        ~ plan cambió: {base['shape']} -> {summary['shape']}")
+        failed += bool(problems)
+
+    print(f"{len(CASES) - failed}/{len(CASES)} consultas dentro de presupuesto")
+    return 1 if failed else 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Harness de planes de ejecución por endpoint")
+    parser.add_argument("command", choices=["record", "check"])
+    parser.add_argument("--sku", help="SKU de muestra (por defecto, el de más movimientos)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "record":
+            return record(args.baseline, args.sku)
+        return check(args.baseline, args.sku)
+    except RuntimeError as exc:
+        print(f"ERROR: {exc}", file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
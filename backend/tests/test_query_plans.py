@@ -0,0 +1,125 @@
+import psycopg2
+import pytest
+
+from app import query_plans as qp
+from app.db import get_conn
+
+
+def _plan(node_type="Seq Scan", relation="forecast", hit=10, read=0, ms=1.0, rows=100, loops=1):
+    """Plan EXPLAIN (FORMAT JSON) sintético: Aggregate sobre un scan."""
+    return {
+        "Plan": {
+            "Node Type": "Aggregate",
+            "Plan Rows": 1,
+            "Actual Rows": 1,
+            "Actual Loops": 1,
+            "Shared Hit Blocks": hit,
+            "Shared Read Blocks": read,
+            "Plans": [{
+                "Node Type": node_type,
+                "Relation Name": relation,
+                "Plan Rows": 5,
+                "Actual Rows": rows,
+                "Actual Loops": loops,
+            }],
+        },
+        "Planning Time": 0.1,
+        "Execution Time": ms,
+    }
+
+
+CASE = {"name": "demo", "endpoint": "/api/demo"}
+BIG = {"forecast": qp.LARGE_TABLE_ROWS * 10}
+
+
+def test_summarize_records_per_scan_rows():
+    summary = qp.summarize(_plan(rows=40, loops=3))
+
+    assert summary["shape"] == "Aggregate(Seq Scan[forecast])"
+    assert summary["seq_scans"] == ["forecast"]
+    assert summary["scans"]["forecast"] == {
+        "node": "Seq Scan", "est_rows": 5, "actual_rows": 120, "loops": 3,
+    }
+
+
+def test_seq_scan_on_large_table_is_reported():
+    problems = qp.check_case(CASE, qp.summarize(_plan()), BIG)
+
+    assert any("Seq Scan" in p and "forecast" in p for p in problems)
+
+
+def test_seq_scan_already_in_baseline_passes():
+    summary = qp.summarize(_plan())
+
+    assert qp.check_case(CASE, summary, BIG, baseline=summary) == []
+
+
+def test_new_seq_scan_against_baseline_is_reported():
+    baseline = qp.summarize(_plan(node_type="Index Scan"))
+    problems = qp.check_case(CASE, qp.summarize(_plan()), BIG, baseline)
+
+    assert any("Seq Scan" in p and "forecast" in p for p in problems)
+
+
+def test_seq_scan_on_small_or_allowed_table_passes():
+    summary = qp.summarize(_plan())
+
+    assert qp.check_case(CASE, summary, {"forecast": 10}) == []
+    assert qp.check_case(dict(CASE, allow_seq_scan=["forecast"]), summary, BIG) == []
+
+
+def test_index_scan_on_large_table_passes():
+    summary = qp.summarize(_plan(node_type="Index Scan"))
+
+    assert qp.check_case(CASE, summary, BIG) == []
+
+
+def test_over_budget_buffers_and_time_are_reported():
+    summary = qp.summarize(_plan(node_type="Index Scan", hit=qp.DEFAULT_MAX_BUFFERS, read=1,
+                                 ms=qp.DEFAULT_MAX_MS + 1))
+    problems = qp.check_case(CASE, summary, BIG)
+
+    assert any("buffers" in p and "presupuesto" in p for p in problems)
+    assert any("tiempo" in p and "presupuesto" in p for p in problems)
+    assert not any("tiempo" in p for p in qp.check_case(CASE, summary, BIG, check_time=False))
+
+
+def test_baseline_regression_is_reported():
+    baseline = qp.summarize(_plan(node_type="Index Scan", hit=10, ms=1.0))
+    current = qp.summarize(_plan(node_type="Index Scan", hit=100, ms=20.0))
+    problems = qp.check_case(CASE, current, BIG, baseline)
+
+    assert any("línea base" in p and "buffers" in p for p in problems)
+    assert any("línea base" in p and "tiempo" in p for p in problems)
+
+
+def test_aggregate_runs_takes_median_run():
+    runs = [qp.summarize(_plan(ms=ms, hit=hit, read=read))
+            for ms, hit, read in [(9.0, 5, 5), (1.0, 10, 0), (2.0, 8, 2)]]
+    summary = qp.aggregate_runs(runs)
+
+    assert summary["execution_ms"] == 2.0
+    assert summary["execution_ms_min"] == 1.0
+    assert summary["shared_hit"] + summary["shared_read"] == summary["buffers"] == 10
+    assert summary["shared_read_max"] == 5
+    assert summary["runs"] == 3
+
+
+def test_unanalyzed_tables_only_counts_queried_tables():
+    sizes = {"forecast": -1, "inventory_movements": 100, "tabla_ajena": -1}
+
+    assert qp.unanalyzed_tables(sizes) == ["forecast"]
+
+
+def _db_available():
+    try:
+        get_conn().close()
+        return True
+    except psycopg2.OperationalError:
+        return False
+
+
+@pytest.mark.skipif(not _db_available(), reason="base tsp_inventory no disponible")
+def test_endpoint_queries_within_buffer_budget():
+    # los tiempos dependen de la máquina: se validan con `python -m app.query_plans check`
+    assert qp.check(check_time=False) == 0